@@ -8,29 +8,60 @@ Usage:
 """
 
 import json
+import os
 import yaml
+from multiprocessing import Pool
 from pathlib import Path
 
+# Prefer the libyaml-backed loader; PyYAML wheels ship it on most platforms
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Below this many profiles, worker startup costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+def load_app(yaml_file):
+    with open(yaml_file) as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def write_apps(out, apps):
+    """Stream apps into out, matching json.dump(output, f, indent=2) byte for byte"""
+    count = 0
+    out.write('{\n  "version": "1.0.0",\n  "apps": [')
+
+    for app in apps:
+        out.write(",\n    " if count else "\n    ")
+        out.write(json.dumps(app, indent=2).replace("\n", "\n    "))
+        count += 1
+
+    out.write("\n  ]\n}" if count else "]\n}")
+    return count
+
 def main():
     apps_dir = Path(__file__).parent.parent / "apps"
     output_file = Path(__file__).parent.parent / "apps.json"
 
-    apps = []
-
-    for yaml_file in sorted(apps_dir.glob("*.yaml")):
-        with open(yaml_file) as f:
-            app = yaml.safe_load(f)
-            apps.append(app)
-
-    output = {
-        "version": "1.0.0",
-        "apps": apps
-    }
+    yaml_files = sorted(apps_dir.glob("*.yaml"))
 
-    with open(output_file, "w") as f:
-        json.dump(output, f, indent=2)
+    # Profiles are independent, so parse them across processes. imap keeps
+    # file order for deterministic output while still streaming results.
+    # Write to a temp file so a bad profile leaves the old apps.json intact.
+    tmp_file = output_file.with_suffix(".json.tmp")
+    try:
+        with open(tmp_file, "w") as out:
+            if len(yaml_files) < PARALLEL_THRESHOLD:
+                count = write_apps(out, map(load_app, yaml_files))
+            else:
+                with Pool() as pool:
+                    count = write_apps(out, pool.imap(load_app, yaml_files, chunksize=32))
+        os.replace(tmp_file, output_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
 
-    print(f"Generated {output_file} with {len(apps)} apps")
+    print(f"Generated {output_file} with {count} apps")
 
 if __name__ == "__main__":
     main()
@@ -11,6 +11,7 @@ Usage:
     python discover-apps.py --submit URL       # Submit to registry endpoint
     python discover-apps.py --ai-only          # Only apps likely to use AI
     python discover-apps.py --with-icons       # Extract app icons as PNG
+    python discover-apps.py --jobs 8 --subprocess-timeout 5  # Tune concurrency/timeouts
 """
 
 import json
@@ -20,12 +21,34 @@ import plistlib
 import re
 import subprocess
 import sys
+import tempfile
 import base64
+import configparser
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# orjson is optional; it speeds up serializing icon-heavy --submit payloads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyobjc is optional; with it icons are converted in-process via ImageIO
+try:
+    import Quartz
+    from Foundation import NSMutableData, NSURL
+except ImportError:
+    Quartz = None
 
 # Known AI-related apps and keywords
 AI_APP_KEYWORDS = [
@@ -49,6 +72,54 @@ AI_HOST_APPS = [
     'emacs', 'nova', 'bbedit', 'textmate',
 ]
 
+# Vendor name from NSHumanReadableCopyright, e.g. "© 2024 Acme Inc. All rights reserved"
+_COPYRIGHT_RE = re.compile(r'©\s*\d*\s*(.+?)(?:\.|All rights|$)')
+
+# Runs of characters not allowed in an app_id
+_APP_ID_RE = re.compile(r'[^a-z0-9]+')
+
+# Category keywords for AI apps, checked in order
+AI_CATEGORY_KEYWORDS = (
+    ("dev_tools", ('code', 'ide', 'cursor', 'copilot', 'cody', 'studio', 'zed')),
+    ("chat", ('chat', 'claude', 'gpt', 'gemini', 'perplexity')),
+    ("productivity", ('notion', 'obsidian', 'grammarly')),
+    ("creative", ('midjourney', 'dall', 'stable', 'runway')),
+)
+
+# Keyword lists compiled into single patterns so each check is one scan
+_AI_APP_RE = re.compile('|'.join(map(re.escape, AI_APP_KEYWORDS)))
+_AI_HOST_RE = re.compile('|'.join(map(re.escape, AI_HOST_APPS)))
+
+# Per-bundle metadata cache, invalidated by Info.plist and bundle mtime
+CACHE_FILE = Path.home() / ".cache" / "oisp" / "app-discovery.json"
+CACHE_VERSION = 1
+
+# Stable per-machine identifier; the hostname does not change during a run
+MACHINE_ID = hashlib.sha256(platform.node().encode()).hexdigest()[:12]
+
+# Info.plist files are typically a few KB; anything past this is skipped
+MAX_PLIST_BYTES = 4 * 1024 * 1024
+
+# Byte-order marks and whitespace allowed before an XML plist's first '<'
+PLIST_XML_LEADING = b'\xef\xbb\xbf\xfe\xff\x00 \t\r\n'
+
+# codesign's message for a bundle with no signature, after "<path>"
+UNSIGNED_SUFFIX = ': code object is not signed at all'
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Default thread pool size for per-app metadata extraction (I/O and subprocess bound)
+DEFAULT_JOBS = min(16, (os.cpu_count() or 4) * 4)
+
+# Default per-call timeout in seconds for codesign/sips/mdfind
+DEFAULT_SUBPROCESS_TIMEOUT = 10
+
+# Windows directories that never contain user-facing apps
+WINDOWS_NOISE_DIRS = {'$recycle.bin', 'windowsapps', 'common files', 'microsoft shared'}
+
+# Windows executables that are installers/updaters, not apps
+WINDOWS_SKIP_TOKENS = ('uninstall', 'update', 'setup', 'installer')
+
 @dataclass
 class AppSignature:
     """Platform-specific app signature"""
@@ -81,46 +152,61 @@ class DiscoveredApp:
     is_ai_app: bool = False
     is_ai_host: bool = False
     discovered_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    machine_id: str = field(default_factory=lambda: hashlib.sha256(platform.node().encode()).hexdigest()[:12])
+    machine_id: str = field(default_factory=lambda: MACHINE_ID)
 
     def to_dict(self, include_icon: bool = True) -> Dict[str, Any]:
         """Convert to dictionary, removing None values"""
-        d = asdict(self)
-        # Clean up None values and empty signatures
-        if d.get('macos') and not any(v for v in d['macos'].values() if v):
-            d['macos'] = None
-        if d.get('windows') and not any(v for v in d['windows'].values() if v):
-            d['windows'] = None
-        if d.get('linux') and not any(v for v in d['linux'].values() if v):
-            d['linux'] = None
-        # Remove icon if not requested (for smaller JSON in apps.json)
-        if not include_icon:
-            d.pop('icon_base64', None)
-        return {k: v for k, v in d.items() if v is not None}
-
-
+        # Built by hand rather than via asdict() to avoid deep-copying every
+        # field (notably icon_base64) only to filter most of it out again
+        d: Dict[str, Any] = {'app_id': self.app_id, 'name': self.name}
+        if self.vendor is not None:
+            d['vendor'] = self.vendor
+        d['category'] = self.category
+        d['path'] = self.path
+
+        # Skip empty signatures and their unset fields
+        for platform_name in ('macos', 'windows', 'linux'):
+            sig = getattr(self, platform_name)
+            if sig:
+                sig_dict = {k: v for k, v in vars(sig).items() if v}
+                if sig_dict:
+                    d[platform_name] = sig_dict
+
+        if self.icon_path is not None:
+            d['icon_path'] = self.icon_path
+        # Leave out icon if not requested (for smaller JSON in apps.json)
+        if include_icon and self.icon_base64 is not None:
+            d['icon_base64'] = self.icon_base64
+
+        d['is_ai_app'] = self.is_ai_app
+        d['is_ai_host'] = self.is_ai_host
+        d['discovered_at'] = self.discovered_at
+        d['machine_id'] = self.machine_id
+        return d
+
+
+@lru_cache(maxsize=4096)
 def is_ai_related(name: str, bundle_id: str = "") -> tuple[bool, bool]:
     """Check if app is AI-related or hosts AI extensions"""
     name_lower = name.lower()
     bundle_lower = bundle_id.lower() if bundle_id else ""
 
-    # Check if it's an AI app
-    for keyword in AI_APP_KEYWORDS:
-        if keyword in name_lower or keyword in bundle_lower:
-            return True, False
+    # Check if it's an AI app (NUL separator keeps matches from spanning both)
+    if _AI_APP_RE.search(f"{name_lower}\0{bundle_lower}"):
+        return True, False
 
     # Check if it hosts AI extensions
-    for host in AI_HOST_APPS:
-        if host in name_lower:
-            return False, True
+    if _AI_HOST_RE.search(name_lower):
+        return False, True
 
     return False, False
 
 
+@lru_cache(maxsize=4096)
 def generate_app_id(name: str) -> str:
     """Generate a valid app_id from name"""
     app_id = name.lower()
-    app_id = re.sub(r'[^a-z0-9]+', '-', app_id)
+    app_id = _APP_ID_RE.sub('-', app_id)
     app_id = app_id.strip('-')
     return app_id
 
@@ -143,12 +229,77 @@ def run_command_binary(cmd: List[str], timeout: int = 30) -> Optional[bytes]:
         return None
 
 
+def convert_icon_native(icon_path: Path, size: int = 128) -> Optional[bytes]:
+    """Convert an image to a size x size PNG in-process using ImageIO"""
+    url = NSURL.fileURLWithPath_(str(icon_path))
+    source = Quartz.CGImageSourceCreateWithURL(url, None)
+    if source is None:
+        return None
+
+    # .icns holds several renditions; use the smallest one at least size wide
+    widths = {}
+    for index in range(Quartz.CGImageSourceGetCount(source)):
+        props = Quartz.CGImageSourceCopyPropertiesAtIndex(source, index, None) or {}
+        widths[index] = props.get(Quartz.kCGImagePropertyPixelWidth, 0)
+    if not widths:
+        return None
+    large_enough = [i for i, w in widths.items() if w >= size]
+    if large_enough:
+        best_index = min(large_enough, key=widths.get)
+    else:
+        best_index = max(widths, key=widths.get)
+
+    image = Quartz.CGImageSourceCreateThumbnailAtIndex(source, best_index, {
+        Quartz.kCGImageSourceCreateThumbnailFromImageAlways: True,
+        Quartz.kCGImageSourceThumbnailMaxPixelSize: size,
+    })
+    if image is None:
+        return None
+
+    data = NSMutableData.data()
+    dest = Quartz.CGImageDestinationCreateWithData(data, 'public.png', 1, None)
+    if dest is None:
+        return None
+    Quartz.CGImageDestinationAddImage(dest, image, None)
+    if not Quartz.CGImageDestinationFinalize(dest):
+        return None
+    return bytes(data)
+
+
+def extract_png(data: bytes) -> Optional[bytes]:
+    """Return the first complete PNG embedded in data, walking chunk lengths"""
+    start = data.find(PNG_SIGNATURE)
+    if start == -1:
+        return None
+
+    pos = start + len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], 'big')
+        chunk_type = data[pos + 4:pos + 8]
+        pos += 12 + length  # length + type + data + CRC
+        if pos > len(data):
+            return None
+        if chunk_type == b'IEND':
+            return data[start:pos]
+    return None
+
+
 class MacOSDiscoverer:
     """Discover apps on macOS"""
 
-    def __init__(self, extract_icons: bool = False, icons_dir: Optional[Path] = None):
+    def __init__(self, extract_icons: bool = False, icons_dir: Optional[Path] = None,
+                 jobs: int = DEFAULT_JOBS, subprocess_timeout: int = DEFAULT_SUBPROCESS_TIMEOUT,
+                 ai_only: bool = False):
         self.extract_icons = extract_icons
+        self.ai_only = ai_only
         self.icons_dir = icons_dir
+        self.jobs = jobs
+        self.subprocess_timeout = subprocess_timeout
+        self._team_ids: Dict[str, Optional[str]] = {}
+        self._previous_cache: Dict[str, Any] = {}
+        self._cache: Dict[str, Any] = {}
+        self._plists: Dict[str, dict] = {}
+        self._cached_apps: Dict[str, DiscoveredApp] = {}
         self.search_paths = [
             Path("/Applications"),
             Path.home() / "Applications",
@@ -160,47 +311,182 @@ class MacOSDiscoverer:
         apps = []
         seen_bundle_ids = set()
 
-        for search_path in self.search_paths:
-            if not search_path.exists():
-                continue
+        # Prefer the Spotlight index; fall back to walking the filesystem
+        app_paths = self._list_bundles_via_mdfind()
+        if not app_paths:
+            app_paths = []
+            for search_path in self.search_paths:
+                if search_path.exists():
+                    app_paths.extend(self._iter_app_bundles(search_path))
+
+        unique_paths = []
+        seen_paths = set()
+        for app_path in app_paths:
+            resolved = app_path.resolve()
+            if resolved not in seen_paths:
+                seen_paths.add(resolved)
+                unique_paths.append(app_path)
+
+        # Only entries touched this run are written back, pruning removed apps
+        self._previous_cache = self._load_cache()
+        self._cache = {}
+        self._plists = {}
+        self._cached_apps = {}
+
+        # Plist reads and codesign calls are I/O bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            # Read bundle IDs first so duplicates skip codesign and icon extraction
+            candidates = list(executor.map(self._peek_bundle_id, unique_paths))
+
+            selected_paths = []
+            uncached_paths = []
+            for app_path, bundle_id, cached in candidates:
+                if not bundle_id or bundle_id in seen_bundle_ids:
+                    continue
+                seen_bundle_ids.add(bundle_id)
+                selected_paths.append(app_path)
+                if not cached:
+                    uncached_paths.append(app_path)
+
+            # One codesign process for every uncached bundle instead of one per bundle
+            self._team_ids = self._get_team_ids(uncached_paths)
 
-            # Find all .app bundles (but not too deep)
-            for app_path in search_path.glob("*.app"):
-                app = self._discover_app(app_path)
-                if app and app.macos and app.macos.bundle_id:
-                    if app.macos.bundle_id not in seen_bundle_ids:
-                        seen_bundle_ids.add(app.macos.bundle_id)
-                        apps.append(app)
-
-            # Also check one level deep (for folders like "Utilities")
-            for subdir in search_path.iterdir():
-                if subdir.is_dir() and not subdir.suffix == '.app':
-                    for app_path in subdir.glob("*.app"):
-                        app = self._discover_app(app_path)
-                        if app and app.macos and app.macos.bundle_id:
-                            if app.macos.bundle_id not in seen_bundle_ids:
-                                seen_bundle_ids.add(app.macos.bundle_id)
-                                apps.append(app)
+            for app in executor.map(self._discover_app, selected_paths):
+                if app:
+                    apps.append(app)
+
+        self._plists.clear()
+        self._cached_apps.clear()
+        self._save_cache()
 
         return apps
 
-    def _discover_app(self, app_path: Path) -> Optional[DiscoveredApp]:
-        """Extract information from a single .app bundle"""
-        info_plist = app_path / "Contents" / "Info.plist"
-        if not info_plist.exists():
+    def _peek_bundle_id(self, app_path: Path) -> Tuple[Path, Optional[str], bool]:
+        """Return (app_path, bundle_id, cached) from the cache or Info.plist.
+
+        With ai_only, bundles that are not AI-related get a None bundle_id so
+        they are dropped before codesign and icon extraction.
+        """
+        stamp = self._cache_stamp(app_path)
+        app = self._cached_app(app_path, stamp)
+        if app:
+            if self.ai_only and not app.is_ai_app and not app.is_ai_host:
+                return app_path, None, True
+            # Keep the rebuilt app so _discover_app does not rebuild it
+            self._cached_apps[str(app_path)] = app
+            return app_path, app.macos.bundle_id, True
+
+        plist = self._read_info_plist(app_path, stamp)
+        if plist is None:
+            return app_path, None, False
+
+        bundle_id = plist.get('CFBundleIdentifier')
+        if self.ai_only and bundle_id:
+            is_ai, is_host = is_ai_related(self._bundle_name(app_path, plist), bundle_id)
+            if not is_ai and not is_host:
+                return app_path, None, False
+
+        # Keep the parsed plist so _discover_app does not read it again
+        self._plists[str(app_path)] = plist
+        return app_path, bundle_id, False
+
+    def _bundle_name(self, app_path: Path, plist: dict) -> str:
+        return plist.get('CFBundleName') or plist.get('CFBundleDisplayName') or app_path.stem
+
+    def _list_bundles_via_mdfind(self) -> Optional[List[Path]]:
+        """List .app bundles in the search paths with a single Spotlight query"""
+        roots = [p for p in self.search_paths if p.exists()]
+        if not roots:
             return None
 
-        try:
-            with open(info_plist, 'rb') as f:
-                plist = plistlib.load(f)
-        except Exception:
+        cmd = ['mdfind']
+        for root in roots:
+            cmd += ['-onlyin', str(root)]
+        cmd.append('kMDItemContentType == "com.apple.application-bundle"')
+
+        output = run_command(cmd, timeout=self.subprocess_timeout)
+        if not output:
             return None
 
+        ranked = []
+        for line in output.splitlines():
+            if not line.endswith('.app'):
+                continue
+            app_path = Path(line)
+            # Match the filesystem walk: top level or one folder deep, no nested bundles
+            for root_index, root in enumerate(roots):
+                try:
+                    rel = app_path.relative_to(root)
+                except ValueError:
+                    continue
+                if len(rel.parts) == 1 or (len(rel.parts) == 2 and not rel.parts[0].endswith('.app')):
+                    ranked.append((root_index, len(rel.parts), line))
+                break
+
+        # Spotlight order is arbitrary; keep the walk's precedence (search path
+        # order, then top-level before subfolders) so dedup picks the same copy
+        ranked.sort()
+        return [Path(line) for _, _, line in ranked]
+
+    def _iter_app_bundles(self, root: Path) -> Iterator[Path]:
+        """Yield .app bundles in root and one level deep (for folders like "Utilities")"""
+        # scandir's DirEntry caches the file type, saving a stat() per entry;
+        # is_dir() only stats symlinks, so symlinked bundles are still found
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            return
+
+        # Top-level bundles first, then subfolders, matching the original order
+        subdirs = []
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            if entry.name.endswith('.app'):
+                yield Path(entry.path)
+            else:
+                subdirs.append(entry.path)
+
+        for subdir in subdirs:
+            try:
+                with os.scandir(subdir) as sub_it:
+                    for sub_entry in sub_it:
+                        if sub_entry.name.endswith('.app') and sub_entry.is_dir():
+                            yield Path(sub_entry.path)
+            except OSError:
+                pass
+
+    def _discover_app(self, app_path: Path) -> Optional[DiscoveredApp]:
+        """Extract information from a single .app bundle"""
+        stamp = None
+        app = self._cached_apps.pop(str(app_path), None)
+        if app is None:
+            stamp = self._cache_stamp(app_path)
+            if stamp is None:
+                return None
+            app = self._cached_app(app_path, stamp)
+
+        # Unchanged bundles skip plist parsing, codesign and icon extraction
+        if app:
+            if self.ai_only and not app.is_ai_app and not app.is_ai_host:
+                return None
+            icon = self._cache[str(app_path)].get('icon')
+            if self.extract_icons and icon:
+                self._attach_icon(app, base64.b64decode(icon))
+            return app
+
+        plist = self._plists.pop(str(app_path), None)
+        if plist is None:
+            plist = self._read_info_plist(app_path, stamp)
+            if plist is None:
+                return None
+
         bundle_id = plist.get('CFBundleIdentifier', '')
         if not bundle_id:
             return None
 
-        name = plist.get('CFBundleName') or plist.get('CFBundleDisplayName') or app_path.stem
+        name = self._bundle_name(app_path, plist)
         version = plist.get('CFBundleShortVersionString', '')
         executable = plist.get('CFBundleExecutable', '')
 
@@ -208,27 +494,29 @@ class MacOSDiscoverer:
         vendor = None
         copyright_str = plist.get('NSHumanReadableCopyright', '')
         if copyright_str:
-            match = re.search(r'©\s*\d*\s*(.+?)(?:\.|All rights|$)', copyright_str)
+            match = _COPYRIGHT_RE.search(copyright_str)
             if match:
                 vendor = match.group(1).strip()
 
-        # Get code signature info
-        team_id = self._get_team_id(app_path)
-
-        # Check if AI-related
+        # Check if AI-related; with ai_only, skip codesign and icons for the rest
         is_ai, is_host = is_ai_related(name, bundle_id)
+        if self.ai_only and not is_ai and not is_host:
+            return None
+
+        # Get code signature info
+        if str(app_path) in self._team_ids:
+            team_id = self._team_ids[str(app_path)]
+        else:
+            team_id = self._get_team_id(app_path)
 
         # Determine category
         category = "other"
         if is_ai:
-            if any(kw in name.lower() for kw in ['code', 'ide', 'cursor', 'copilot', 'cody', 'studio', 'zed']):
-                category = "dev_tools"
-            elif any(kw in name.lower() for kw in ['chat', 'claude', 'gpt', 'gemini', 'perplexity']):
-                category = "chat"
-            elif any(kw in name.lower() for kw in ['notion', 'obsidian', 'grammarly']):
-                category = "productivity"
-            elif any(kw in name.lower() for kw in ['midjourney', 'dall', 'stable', 'runway']):
-                category = "creative"
+            name_lower = name.lower()
+            for candidate, keywords in AI_CATEGORY_KEYWORDS:
+                if any(kw in name_lower for kw in keywords):
+                    category = candidate
+                    break
         elif is_host:
             category = "dev_tools"
 
@@ -252,24 +540,181 @@ class MacOSDiscoverer:
         )
 
         # Extract icon if requested
+        icon_data = None
         if self.extract_icons:
             icon_data = self._extract_icon(app_path, plist)
             if icon_data:
-                if self.icons_dir:
-                    icon_path = self.icons_dir / f"{app.app_id}.png"
-                    icon_path.write_bytes(icon_data)
-                    app.icon_path = str(icon_path)
-                else:
-                    app.icon_base64 = base64.b64encode(icon_data).decode('utf-8')
+                self._attach_icon(app, icon_data)
+
+        self._cache[str(app_path)] = {
+            'stamp': stamp,
+            'icons': self.extract_icons,
+            'icon': base64.b64encode(icon_data).decode('utf-8') if icon_data else None,
+            'app': {
+                'app_id': app.app_id,
+                'name': app.name,
+                'vendor': app.vendor,
+                'category': app.category,
+                'path': app.path,
+                'is_ai_app': app.is_ai_app,
+                'is_ai_host': app.is_ai_host,
+                'macos': asdict(signature),
+            },
+        }
 
         return app
 
+    def _read_info_plist(self, app_path: Path, stamp: Optional[List[int]]) -> Optional[dict]:
+        """Parse the bundle's Info.plist, or None if missing, oversized or malformed"""
+        # stamp[1] is the Info.plist size; skip pathological plists unread
+        if stamp is None or stamp[1] > MAX_PLIST_BYTES:
+            return None
+
+        try:
+            with open(app_path / "Contents" / "Info.plist", 'rb') as f:
+                data = f.read()
+            # Cheap magic check before handing the bytes to the full parser
+            if not data.startswith(b'bplist') and data.lstrip(PLIST_XML_LEADING)[:1] != b'<':
+                return None
+            plist = plistlib.loads(data)
+        except Exception:
+            return None
+        return plist if isinstance(plist, dict) else None
+
+    def _attach_icon(self, app: DiscoveredApp, icon_data: bytes):
+        """Save icon to icons_dir, or embed it as base64"""
+        if self.icons_dir:
+            icon_path = self.icons_dir / f"{app.app_id}.png"
+            # Apps sharing a display name share an app_id; write via a temp
+            # file so concurrent workers never interleave bytes in one PNG
+            fd, tmp_path = tempfile.mkstemp(dir=self.icons_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(icon_data)
+                os.replace(tmp_path, icon_path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            app.icon_path = str(icon_path)
+        else:
+            app.icon_base64 = base64.b64encode(icon_data).decode('utf-8')
+
+    def _cache_stamp(self, app_path: Path) -> Optional[List[int]]:
+        """Info.plist mtime/size plus bundle mtime, or None if there is no Info.plist"""
+        try:
+            plist_stat = (app_path / "Contents" / "Info.plist").stat()
+            bundle_stat = app_path.stat()
+        except OSError:
+            return None
+        return [plist_stat.st_mtime_ns, plist_stat.st_size, bundle_stat.st_mtime_ns]
+
+    def _cached_app(self, app_path: Path, stamp: Optional[List[int]]) -> Optional[DiscoveredApp]:
+        """Rebuild app_path's DiscoveredApp from the cache if its entry is still valid"""
+        entry = self._previous_cache.get(str(app_path))
+        if not isinstance(entry, dict) or entry.get('stamp') != stamp:
+            return None
+        if self.extract_icons and not entry.get('icons'):
+            return None
+        # Entries that no longer match the dataclasses count as a miss
+        app = self._app_from_cache(entry)
+        if app is None:
+            return None
+        self._cache[str(app_path)] = entry
+        return app
+
+    def _app_from_cache(self, entry: Dict[str, Any]) -> Optional[DiscoveredApp]:
+        """Rebuild a DiscoveredApp from a cache entry, or None if it is malformed"""
+        try:
+            return DiscoveredApp(
+                **{k: v for k, v in entry['app'].items() if k != 'macos'},
+                macos=AppSignature(**entry['app']['macos']),
+            )
+        except (KeyError, TypeError, AttributeError):
+            return None
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(CACHE_FILE) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+            return {}
+        apps = cache.get('apps')
+        return apps if isinstance(apps, dict) else {}
+
+    def _save_cache(self):
+        try:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = CACHE_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'apps': self._cache}, f)
+            os.replace(tmp_file, CACHE_FILE)
+        except OSError as e:
+            print(f"Failed to write discovery cache: {e}", file=sys.stderr)
+
+    def _get_team_ids(self, app_paths: List[Path]) -> Dict[str, Optional[str]]:
+        """Get Team IDs for many bundles from a single codesign invocation.
+
+        Only bundles codesign reported on are included; callers fall back to
+        _get_team_id for the rest (including everything if the call fails).
+        """
+        if not app_paths:
+            return {}
+
+        try:
+            result = subprocess.run(
+                ['codesign', '-dv'] + [str(p) for p in app_paths],
+                capture_output=True, text=True,
+                timeout=self.subprocess_timeout + len(app_paths)
+            )
+            output = result.stderr  # codesign outputs to stderr
+        except subprocess.TimeoutExpired as e:
+            # Keep whatever was reported before the hung bundle
+            output = e.stderr or ''
+            if isinstance(output, bytes):
+                output = output.decode('utf-8', errors='replace')
+            # The last line may have been cut off mid-value
+            output = output[:output.rfind('\n') + 1]
+        except OSError:
+            return {}
+
+        # Executables are matched by resolved path, so symlinked bundles and
+        # firmlinked system apps still map back to the path we were given
+        app_keys: Dict[str, str] = {}
+        for p in app_paths:
+            app_keys[str(p)] = str(p)
+            app_keys[str(p.resolve())] = str(p)
+
+        team_ids: Dict[str, Optional[str]] = {}
+        current_app = None
+        for line in output.split('\n'):
+            if line.endswith(UNSIGNED_SUFFIX):
+                app_key = app_keys.get(line[:-len(UNSIGNED_SUFFIX)])
+                if app_key:
+                    team_ids[app_key] = None
+            elif line.startswith('Executable='):
+                # Map the executable back to the bundle that contains it
+                current_app = None
+                for parent in Path(line.split('=', 1)[1].strip()).resolve().parents:
+                    if str(parent) in app_keys:
+                        current_app = app_keys[str(parent)]
+                        break
+            elif current_app and line.startswith('TeamIdentifier='):
+                team_id = line.split('=', 1)[1].strip()
+                team_ids[current_app] = team_id if team_id and team_id != 'not set' else None
+        return team_ids
+
     def _get_team_id(self, app_path: Path) -> Optional[str]:
         """Get Apple Developer Team ID from code signature"""
-        result = subprocess.run(
-            ['codesign', '-dv', str(app_path)],
-            capture_output=True, text=True, timeout=10
-        )
+        try:
+            result = subprocess.run(
+                ['codesign', '-dv', str(app_path)],
+                capture_output=True, text=True, timeout=self.subprocess_timeout
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
         output = result.stderr  # codesign outputs to stderr
         if output:
             for line in output.split('\n'):
@@ -312,25 +757,23 @@ class MacOSDiscoverer:
         if not icon_path.exists():
             return None
 
-        # Convert icns to png using sips (macOS built-in)
-        try:
-            # Create a temp file for output
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                tmp_path = tmp.name
+        if Quartz:
+            try:
+                png_data = convert_icon_native(icon_path)
+                if png_data:
+                    return png_data
+            except Exception as e:
+                print(f"Failed to convert icon natively for {app_path.name}: {e}", file=sys.stderr)
 
-            result = subprocess.run(
-                ['sips', '-s', 'format', 'png', '-z', '128', '128', str(icon_path), '--out', tmp_path],
-                capture_output=True, timeout=10
+        # Convert icns to png using sips (macOS built-in), streaming to a pipe
+        try:
+            data = run_command_binary(
+                ['sips', '-s', 'format', 'png', '-z', '128', '128', str(icon_path), '--out', '/dev/stdout'],
+                timeout=self.subprocess_timeout
             )
-
-            if result.returncode == 0 and Path(tmp_path).exists():
-                png_data = Path(tmp_path).read_bytes()
-                os.unlink(tmp_path)
-                return png_data
-            else:
-                if Path(tmp_path).exists():
-                    os.unlink(tmp_path)
+            if data:
+                # sips also echoes the input/output paths on stdout around the image
+                return extract_png(data)
         except Exception as e:
             print(f"Failed to extract icon for {app_path.name}: {e}", file=sys.stderr)
 
@@ -340,9 +783,14 @@ class MacOSDiscoverer:
 class WindowsDiscoverer:
     """Discover apps on Windows"""
 
-    def __init__(self, extract_icons: bool = False, icons_dir: Optional[Path] = None):
+    def __init__(self, extract_icons: bool = False, icons_dir: Optional[Path] = None,
+                 jobs: int = DEFAULT_JOBS, subprocess_timeout: int = DEFAULT_SUBPROCESS_TIMEOUT,
+                 ai_only: bool = False):
         self.extract_icons = extract_icons
+        self.ai_only = ai_only
         self.icons_dir = icons_dir
+        self.jobs = jobs
+        self.subprocess_timeout = subprocess_timeout
 
     def discover_all(self) -> List[DiscoveredApp]:
         """Discover installed applications on Windows"""
@@ -354,15 +802,33 @@ class WindowsDiscoverer:
             Path(os.environ.get('LOCALAPPDATA', '')) / 'Programs',
         ]
 
+        exe_paths = []
+        seen_roots = set()
         for search_path in search_paths:
             if not search_path.exists():
                 continue
 
-            for exe_path in search_path.rglob("*.exe"):
-                if any(skip in exe_path.name.lower() for skip in ['uninstall', 'update', 'setup', 'installer']):
-                    continue
-
-                app = self._discover_app(exe_path)
+            # Search roots can coincide (e.g. both Program Files vars pointing
+            # at the same directory on 32-bit Windows); resolve roots, not files
+            resolved_root = search_path.resolve()
+            if resolved_root in seen_roots:
+                continue
+            seen_roots.add(resolved_root)
+
+            for root, dirs, files in os.walk(search_path):
+                # Prune noise directories before os.walk descends into them
+                dirs[:] = [d for d in dirs if d.lower() not in WINDOWS_NOISE_DIRS]
+
+                for file_name in files:
+                    file_lower = file_name.lower()
+                    if not file_lower.endswith('.exe'):
+                        continue
+                    if any(skip in file_lower for skip in WINDOWS_SKIP_TOKENS):
+                        continue
+                    exe_paths.append(Path(root) / file_name)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for app in executor.map(self._discover_app, exe_paths):
                 if app:
                     apps.append(app)
 
@@ -395,9 +861,14 @@ class WindowsDiscoverer:
 class LinuxDiscoverer:
     """Discover apps on Linux"""
 
-    def __init__(self, extract_icons: bool = False, icons_dir: Optional[Path] = None):
+    def __init__(self, extract_icons: bool = False, icons_dir: Optional[Path] = None,
+                 jobs: int = DEFAULT_JOBS, subprocess_timeout: int = DEFAULT_SUBPROCESS_TIMEOUT,
+                 ai_only: bool = False):
         self.extract_icons = extract_icons
+        self.ai_only = ai_only
         self.icons_dir = icons_dir
+        self.jobs = jobs
+        self.subprocess_timeout = subprocess_timeout
 
     def discover_all(self) -> List[DiscoveredApp]:
         """Discover installed applications on Linux"""
@@ -409,12 +880,22 @@ class LinuxDiscoverer:
             Path.home() / '.local/share/applications',
         ]
 
+        desktop_files = []
         for desktop_dir in desktop_dirs:
             if not desktop_dir.exists():
                 continue
 
-            for desktop_file in desktop_dir.glob('*.desktop'):
-                app = self._parse_desktop_file(desktop_file)
+            try:
+                with os.scandir(desktop_dir) as it:
+                    desktop_files.extend(
+                        Path(entry.path) for entry in it
+                        if entry.name.endswith('.desktop') and entry.is_file()
+                    )
+            except OSError:
+                continue
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for app in executor.map(self._parse_desktop_file, desktop_files):
                 if app:
                     apps.append(app)
 
@@ -422,24 +903,32 @@ class LinuxDiscoverer:
 
     def _parse_desktop_file(self, desktop_file: Path) -> Optional[DiscoveredApp]:
         """Parse a .desktop file"""
+        # Only [Desktop Entry] counts; [Desktop Action *] sections have their own Name=
+        parser = configparser.ConfigParser(interpolation=None, strict=False, delimiters=('=',))
+        parser.optionxform = str  # keys are case-sensitive in the desktop entry spec
         try:
-            content = desktop_file.read_text()
-        except Exception:
+            parser.read(desktop_file, encoding='utf-8')
+        except (configparser.MissingSectionHeaderError, UnicodeDecodeError):
+            return None
+        except configparser.ParsingError:
+            # Stray lines without '='; the sections are already populated
+            pass
+        except configparser.Error:
+            return None
+        if not parser.has_section('Desktop Entry'):
             return None
 
-        name = None
-        exec_path = None
-
-        for line in content.split('\n'):
-            if line.startswith('Name='):
-                name = line.split('=', 1)[1].strip()
-            elif line.startswith('Exec='):
-                exec_path = line.split('=', 1)[1].split()[0].strip()
+        entry = parser['Desktop Entry']
+        name = entry.get('Name', '').strip()
+        exec_args = entry.get('Exec', '').split()
+        exec_path = exec_args[0].strip('"') if exec_args else None
 
         if not name:
             return None
 
         is_ai, is_host = is_ai_related(name)
+        if self.ai_only and not is_ai and not is_host:
+            return None
 
         signature = AppSignature(
             paths=[exec_path] if exec_path else [],
@@ -457,25 +946,25 @@ class LinuxDiscoverer:
         )
 
 
-def discover_apps(ai_only: bool = False, extract_icons: bool = False, icons_dir: Optional[Path] = None) -> List[DiscoveredApp]:
+def discover_apps(ai_only: bool = False, extract_icons: bool = False, icons_dir: Optional[Path] = None,
+                  jobs: int = DEFAULT_JOBS, subprocess_timeout: int = DEFAULT_SUBPROCESS_TIMEOUT) -> List[DiscoveredApp]:
     """Discover apps on the current platform"""
     system = platform.system()
+    options = dict(extract_icons=extract_icons, icons_dir=icons_dir,
+                   jobs=jobs, subprocess_timeout=subprocess_timeout, ai_only=ai_only)
 
     if system == 'Darwin':
-        discoverer = MacOSDiscoverer(extract_icons=extract_icons, icons_dir=icons_dir)
+        discoverer = MacOSDiscoverer(**options)
     elif system == 'Windows':
-        discoverer = WindowsDiscoverer(extract_icons=extract_icons, icons_dir=icons_dir)
+        discoverer = WindowsDiscoverer(**options)
     elif system == 'Linux':
-        discoverer = LinuxDiscoverer(extract_icons=extract_icons, icons_dir=icons_dir)
+        discoverer = LinuxDiscoverer(**options)
     else:
         print(f"Unsupported platform: {system}", file=sys.stderr)
         return []
 
     apps = discoverer.discover_all()
 
-    if ai_only:
-        apps = [a for a in apps if a.is_ai_app or a.is_ai_host]
-
     # Sort: AI apps first, then by name
     apps.sort(key=lambda a: (not a.is_ai_app, not a.is_ai_host, a.name.lower()))
 
@@ -484,72 +973,62 @@ def discover_apps(ai_only: bool = False, extract_icons: bool = False, icons_dir:
 
 def to_yaml(app: DiscoveredApp) -> str:
     """Convert app to YAML format"""
-    lines = [
-        f"# {app.name}",
-        f"# Discovered from: {app.path}",
-        "",
-        f"app_id: {app.app_id}",
-        f"name: \"{app.name}\"",
-    ]
-
+    doc: Dict[str, Any] = {'app_id': app.app_id, 'name': app.name}
     if app.vendor:
-        lines.append(f"vendor: \"{app.vendor}\"")
-
-    lines.append(f"category: {app.category}")
-    lines.append("")
-    lines.append("signatures:")
-
-    if app.macos:
-        lines.append("  macos:")
-        if app.macos.bundle_id:
-            lines.append(f"    bundle_id: \"{app.macos.bundle_id}\"")
-        if app.macos.team_id:
-            lines.append(f"    team_id: \"{app.macos.team_id}\"")
-        if app.macos.paths:
-            lines.append("    paths:")
-            for path in app.macos.paths:
-                lines.append(f"      - \"{path}\"")
-        if app.macos.executable_name:
-            lines.append(f"    executable_name: \"{app.macos.executable_name}\"")
-
-    if app.windows:
-        lines.append("  windows:")
-        if app.windows.paths:
-            lines.append("    paths:")
-            for path in app.windows.paths:
-                lines.append(f"      - \"{path}\"")
-        if app.windows.executable_name:
-            lines.append(f"    executable_name: \"{app.windows.executable_name}\"")
-
-    if app.linux:
-        lines.append("  linux:")
-        if app.linux.paths:
-            lines.append("    paths:")
-            for path in app.linux.paths:
-                lines.append(f"      - \"{path}\"")
-        if app.linux.executable_name:
-            lines.append(f"    executable_name: \"{app.linux.executable_name}\"")
-
-    lines.extend([
-        "",
-        "metadata:",
-        f"  discovered_at: \"{app.discovered_at}\"",
-    ])
-
+        doc['vendor'] = app.vendor
+    doc['category'] = app.category
+
+    signatures = {}
+    for platform_name in ('macos', 'windows', 'linux'):
+        sig = getattr(app, platform_name)
+        if sig:
+            signatures[platform_name] = {
+                k: v for k, v in (
+                    ('bundle_id', sig.bundle_id),
+                    ('team_id', sig.team_id),
+                    ('paths', sig.paths),
+                    ('executable_name', sig.executable_name),
+                ) if v
+            }
+    doc['signatures'] = signatures
+
+    metadata: Dict[str, Any] = {'discovered_at': app.discovered_at}
     if app.macos and app.macos.version:
-        lines.append(f"  version_discovered: \"{app.macos.version}\"")
-
+        metadata['version_discovered'] = app.macos.version
     if app.is_ai_app:
-        lines.append("  is_ai_app: true")
+        metadata['is_ai_app'] = True
     if app.is_ai_host:
-        lines.append("  is_ai_host: true")
-
+        metadata['is_ai_host'] = True
     if app.icon_path:
-        lines.append(f"  icon: \"{Path(app.icon_path).name}\"")
-
-    lines.append("")
-
-    return "\n".join(lines)
+        metadata['icon'] = Path(app.icon_path).name
+    doc['metadata'] = metadata
+
+    header = f"# {app.name}\n# Discovered from: {app.path}\n\n"
+    if yaml:
+        # libyaml's C emitter when available; PyYAML is optional for this script
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        return header + yaml.dump(doc, Dumper=dumper, sort_keys=False,
+                                  default_flow_style=False, allow_unicode=True)
+    return header + "\n".join(_dump_yaml_block(doc)) + "\n"
+
+
+def _dump_yaml_block(data: Dict[str, Any], indent: int = 0) -> List[str]:
+    """Minimal block-style YAML emitter used when PyYAML is not installed.
+
+    Scalars are written as JSON, which is valid YAML and handles quoting.
+    """
+    pad = "  " * indent
+    lines = []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            lines.append(f"{pad}{key}:" if value else f"{pad}{key}: {{}}")
+            lines.extend(_dump_yaml_block(value, indent + 1))
+        elif isinstance(value, list):
+            lines.append(f"{pad}{key}:")
+            lines.extend(f"{pad}  - {json.dumps(item)}" for item in value)
+        else:
+            lines.append(f"{pad}{key}: {json.dumps(value)}")
+    return lines
 
 
 def main():
@@ -563,6 +1042,10 @@ def main():
     parser.add_argument('--icons-dir', type=str, help='Directory to save icons')
     parser.add_argument('--submit', type=str, metavar='URL', help='Submit to registry endpoint')
     parser.add_argument('--json', action='store_true', help='Output as JSON (default)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'Parallel workers for per-app metadata (default: {DEFAULT_JOBS})')
+    parser.add_argument('--subprocess-timeout', type=int, default=DEFAULT_SUBPROCESS_TIMEOUT, metavar='SECS',
+                        help=f'Timeout for codesign/sips calls (default: {DEFAULT_SUBPROCESS_TIMEOUT})')
     args = parser.parse_args()
 
     icons_dir = None
@@ -577,7 +1060,9 @@ def main():
     apps = discover_apps(
         ai_only=args.ai_only,
         extract_icons=args.with_icons,
-        icons_dir=icons_dir
+        icons_dir=icons_dir,
+        jobs=max(1, args.jobs),
+        subprocess_timeout=args.subprocess_timeout,
     )
     print(f"Found {len(apps)} apps", file=sys.stderr)
 
@@ -601,12 +1086,19 @@ def main():
             print("---")
 
     elif args.submit:
+        import gzip
         import urllib.request
-        data = json.dumps([a.to_dict() for a in apps]).encode('utf-8')
+        payload = [a.to_dict() for a in apps]
+        if orjson:
+            data = orjson.dumps(payload)
+        else:
+            data = json.dumps(payload).encode('utf-8')
+        # Base64 icons dominate the payload and compress well
+        data = gzip.compress(data, compresslevel=6)
         req = urllib.request.Request(
             args.submit,
             data=data,
-            headers={'Content-Type': 'application/json'},
+            headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
             method='POST'
         )
         try: